@@ -1,6 +1,6 @@
 from flask import Flask, render_template, request, redirect, url_for, Response, flash, session
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 import src.storage as storage
 
 # Tell Flask where to find templates (one level up from src folder)
@@ -37,13 +37,13 @@ def index() -> str:
     
     # build a table of rows: student, assignment, score
     # also compute final grades for display
+    summaries: Dict[int, Tuple[float, float]] = storage.compute_all_summaries()
     students_with_summary: list[Dict[str, Any]] = []
     for s in students:
-        avg: Optional[float] = storage.compute_weighted_average_for_student(s["id"])
-        gpa: Optional[float] = storage.compute_gpa_for_student(s["id"])
+        avg, gpa = summaries.get(s["id"], (None, None))
         students_with_summary.append({"id": s["id"], "name": s["name"], "avg": avg, "gpa": gpa})
     
-    class_avg: Optional[float] = storage.compute_class_average()
+    class_avg: Optional[float] = storage.compute_class_average(summaries=summaries)
     
     return render_template(
         "index.html",
@@ -88,6 +88,9 @@ def students() -> Union[str, Response]:
                 if student_id <= 0:
                     flash("Student ID must be a positive number", "error")
                     return redirect(url_for("students"))
+                if student_id > storage.MAX_STUDENT_ID:
+                    flash(f"Student ID must be at most {storage.MAX_STUDENT_ID}", "error")
+                    return redirect(url_for("students"))
             except ValueError:
                 flash("Student ID must be a valid number", "error")
                 return redirect(url_for("students"))
@@ -129,7 +132,7 @@ def assignments() -> Union[str, Response]:
                 flash("Assignment title required", "error")
             else:
                 # Use the new assignment type parameter
-                storage._gradebook.add_assignment(title, w, assignment_type)
+                storage._get_gradebook().add_assignment(title, w, assignment_type)
                 flash(f"Added {assignment_type}: {title}", "success")
         except ValueError:
             flash("Weight must be a number", "error")
@@ -7,15 +7,45 @@ Object-oriented Student Gradebook Manager with classes:
 """
 
 import json
+import math
+import mmap
+import os
 from pathlib import Path
-from typing import Optional, List, Dict, Union
-from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Tuple, Union
 import csv
 import io
 
+try:
+    import orjson
+except ImportError:  # fall back to the standard library
+    orjson = None
+
 # Default data file (relative to project root -> ../data/data.json)
 DEFAULT_DATA_FILE = Path(__file__).resolve().parents[1] / "data" / "data.json"
 
+# Largest student ID that fits the 64-bit integers used by the JSON serializer
+MAX_STUDENT_ID = 2**63 - 1
+
+# Data files at least this large are parsed from a memory map when orjson is available
+MMAP_THRESHOLD = 4096
+
+# GPA on a 4.0 scale indexed by percent // 10 (0-100)
+_GPA_TABLE = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 2.0, 3.0, 4.0, 4.0)
+
+
+def _dumps(data: Dict) -> bytes:
+    """Serialize data as indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Dict:
+    """Parse JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class InvalidGradeError(ValueError):
     """Custom exception for invalid grades"""
@@ -30,6 +60,8 @@ class DuplicateStudentIDError(ValueError):
 class Student:
     """Represents a student with ID and name"""
     
+    __slots__ = ("id", "name")
+    
     def __init__(self, student_id: int, name: str):
         self.id = student_id
         self.name = name
@@ -56,10 +88,17 @@ class Student:
         return cls(data["id"], data["name"])
 
 
-class Assignment(ABC):
+class Assignment:
     """Abstract base class for assignments"""
     
+    __slots__ = ("id", "title", "weight")
+    
+    # Type name used in serialized data; set by each subclass
+    TYPE: str
+    
     def __init__(self, assignment_id: int, title: str, weight: float = 1.0):
+        if type(self) is Assignment:
+            raise TypeError("Assignment is abstract; use ExamAssignment, QuizAssignment or HomeworkAssignment")
         self.id = assignment_id
         self.title = title
         self.weight = weight
@@ -80,56 +119,67 @@ class Assignment(ABC):
     def __hash__(self):
         return hash((self.id, self.title, self.weight))
     
-    @abstractmethod
+    @property
+    def assignment_type(self) -> str:
+        """The type of assignment"""
+        return self.TYPE
+    
     def get_assignment_type(self) -> str:
         """Return the type of assignment"""
-        pass
+        return self.TYPE
     
     def to_dict(self):
         return {
             "id": self.id, 
             "title": self.title, 
             "weight": self.weight,
-            "type": self.get_assignment_type()
+            "type": self.TYPE
         }
     
     @classmethod
     def from_dict(cls, data: Dict):
-        assignment_type = data.get("type", "exam")
-        if assignment_type == "homework":
-            return HomeworkAssignment(data["id"], data["title"], data["weight"])
-        elif assignment_type == "quiz":
-            return QuizAssignment(data["id"], data["title"], data["weight"])
-        else:
-            return ExamAssignment(data["id"], data["title"], data["weight"])
+        assignment_class = ASSIGNMENT_TYPES.get(data.get("type", "exam"), ExamAssignment)
+        return assignment_class(data["id"], data["title"], data["weight"])
 
 
 class ExamAssignment(Assignment):
     """Exam assignment type"""
     
-    def get_assignment_type(self) -> str:
-        return "exam"
+    __slots__ = ()
+    
+    TYPE = "exam"
 
 
 class QuizAssignment(Assignment):
     """Quiz assignment type"""
     
-    def get_assignment_type(self) -> str:
-        return "quiz"
+    __slots__ = ()
+    
+    TYPE = "quiz"
 
 
 class HomeworkAssignment(Assignment):
     """Homework assignment type"""
     
-    def get_assignment_type(self) -> str:
-        return "homework"
+    __slots__ = ()
+    
+    TYPE = "homework"
+
+
+# Assignment subclasses by their serialized type name
+ASSIGNMENT_TYPES: Dict[str, type] = {
+    assignment_class.TYPE: assignment_class
+    for assignment_class in (ExamAssignment, QuizAssignment, HomeworkAssignment)
+}
 
 
 class Grade:
     """Represents a grade for a student on an assignment"""
     
+    __slots__ = ("student_id", "assignment_id", "score")
+    
     def __init__(self, student_id: int, assignment_id: int, score: float):
-        if score < 0 or score > 100:
+        if not math.isfinite(score) or score < 0 or score > 100:
             raise InvalidGradeError("Score must be between 0 and 100")
         self.student_id = student_id
         self.assignment_id = assignment_id
@@ -167,9 +217,58 @@ class Gradebook:
         self.file_path = Path(file_path or DEFAULT_DATA_FILE)
         self.students: Dict[int, Student] = {}
         self.assignments: Dict[int, Assignment] = {}
-        self.grades: List[Grade] = []
+        # assignment_id -> weight, kept in step with self.assignments
+        self._weights_by_aid: Dict[int, float] = {}
+        # student_id -> assignment_id -> Grade
+        self._grades_by_student: Dict[int, Dict[int, Grade]] = {}
+        # Running weighted-score and weight totals per student
+        self._w_num: Dict[int, float] = {}
+        self._w_den: Dict[int, float] = {}
+        # Derived results are cached per data version; any mutation bumps the version
+        self._version = 0
+        self._summaries_cache: Optional[Tuple[int, Dict[int, Tuple[float, float]]]] = None
+        # Dict snapshots served by get_students/get_assignments/get_grades
+        self._snap_version = -1
+        self._students_snap: List[Dict] = []
+        self._assignments_snap: List[Dict] = []
+        self._grades_snap: List[Dict] = []
+        # Writes are deferred while used as a (possibly nested) context manager
+        self._dirty = False
+        self._batch_depth = 0
+        # Highest IDs handed out so far, so new IDs don't require scanning all keys
+        self._max_student_id = 0
+        self._max_assignment_id = 0
         self._load_data()
     
+    def __enter__(self):
+        """Batch mutations: the data file is written once the outermost block exits"""
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._dirty:
+            self.save()
+        return False
+    
+    @property
+    def grades(self) -> Tuple[Grade, ...]:
+        """All grades grouped by student, derived from the per-student index (read-only)"""
+        return tuple(grade for student_grades in self._grades_by_student.values()
+                     for grade in student_grades.values())
+    
+    @grades.setter
+    def grades(self, grades):
+        """Replace all grades, rebuilding the per-student index and totals"""
+        self._grades_by_student = {}
+        self._w_num.clear()
+        self._w_den.clear()
+        for grade in grades:
+            self._grades_by_student.setdefault(grade.student_id, {})[grade.assignment_id] = grade
+        for student_id in self._grades_by_student:
+            self._recompute_totals(student_id)
+        self._invalidate_caches()
+    
     def _ensure_file(self):
         """Ensure data file exists with default structure"""
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -179,12 +278,12 @@ class Gradebook:
                 "assignments": [],
                 "grades": []
             }
-            self.file_path.write_text(json.dumps(default_data, indent=2))
+            self._write_file(_dumps(default_data))
     
     def _load_data(self):
         """Load data from JSON file"""
         self._ensure_file()
-        data = json.loads(self.file_path.read_text())
+        data = self._read_file()
         
         # Load students
         for student_data in data.get("students", []):
@@ -195,11 +294,22 @@ class Gradebook:
         for assignment_data in data.get("assignments", []):
             assignment = Assignment.from_dict(assignment_data)
             self.assignments[assignment.id] = assignment
+            self._weights_by_aid[assignment.id] = assignment.weight
         
         # Load grades
-        for grade_data in data.get("grades", []):
-            grade = Grade.from_dict(grade_data)
-            self.grades.append(grade)
+        self.grades = [Grade.from_dict(grade_data) for grade_data in data.get("grades", [])]
+        
+        self._max_student_id = max(self.students.keys(), default=0)
+        self._max_assignment_id = max(self.assignments.keys(), default=0)
+    
+    def _read_file(self) -> Dict:
+        """Parse the data file, memory-mapping it when large enough to matter"""
+        if orjson is None or self.file_path.stat().st_size < MMAP_THRESHOLD:
+            return _loads(self.file_path.read_bytes())
+        with open(self.file_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            return orjson.loads(view)
     
     def _save_data(self):
         """Save data to JSON file"""
@@ -208,19 +318,57 @@ class Gradebook:
             "assignments": [assignment.to_dict() for assignment in self.assignments.values()],
             "grades": [grade.to_dict() for grade in self.grades]
         }
-        self.file_path.write_text(json.dumps(data, indent=2))
+        self._write_file(_dumps(data))
+    
+    def _write_file(self, payload: bytes):
+        """Write the data file atomically via a temp file and rename"""
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+    
+    def save(self):
+        """Write all pending changes to the data file"""
+        self._save_data()
+        self._dirty = False
+    
+    def _mark_dirty(self):
+        """Record a mutation and save it unless writes are being batched"""
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.save()
+    
+    def _recompute_totals(self, student_id: int):
+        """Rebuild a student's weighted totals from their current grades"""
+        weights = self._weights_by_aid
+        total_weighted = 0.0
+        total_weight = 0.0
+        
+        for grade in self._grades_by_student.get(student_id, {}).values():
+            weight = weights.get(grade.assignment_id)
+            if weight is not None:
+                total_weighted += grade.score * weight
+                total_weight += weight
+        
+        self._w_num[student_id] = total_weighted
+        self._w_den[student_id] = total_weight
+    
+    def _invalidate_caches(self):
+        """Bump the data version and drop results computed for older versions"""
+        self._version += 1
+        self._summaries_cache = None
     
     def _next_student_id(self) -> int:
         """Get next available student ID"""
-        if not self.students:
-            return 1
-        return max(self.students.keys()) + 1
+        self._max_student_id += 1
+        return self._max_student_id
     
     def _next_assignment_id(self) -> int:
         """Get next available assignment ID"""
-        if not self.assignments:
-            return 1
-        return max(self.assignments.keys()) + 1
+        self._max_assignment_id += 1
+        return self._max_assignment_id
     
     def add_student(self, name: str, student_id: Optional[int] = None) -> Student:
         """Add a new student with manual or auto-generated ID"""
@@ -234,26 +382,36 @@ class Gradebook:
             # Validate student ID is positive
             if student_id <= 0:
                 raise ValueError("Student ID must be a positive number")
+            if student_id > MAX_STUDENT_ID:
+                raise ValueError(f"Student ID must be at most {MAX_STUDENT_ID}")
+            
+            self._max_student_id = max(self._max_student_id, student_id)
         
         student = Student(student_id, name)
         self.students[student_id] = student
-        self._save_data()
+        self._invalidate_caches()
+        self._mark_dirty()
         return student
     
     def add_assignment(self, title: str, weight: float = 1.0, 
                       assignment_type: str = "exam") -> Assignment:
         """Add a new assignment with specified type"""
+        if not math.isfinite(weight):
+            raise ValueError("Weight must be a finite number")
+        
         assignment_id = self._next_assignment_id()
         
-        if assignment_type.lower() == "homework":
-            assignment = HomeworkAssignment(assignment_id, title, weight)
-        elif assignment_type.lower() == "quiz":
-            assignment = QuizAssignment(assignment_id, title, weight)
-        else:
-            assignment = ExamAssignment(assignment_id, title, weight)
+        assignment_class = ASSIGNMENT_TYPES.get(assignment_type.lower(), ExamAssignment)
+        assignment = assignment_class(assignment_id, title, weight)
         
         self.assignments[assignment_id] = assignment
-        self._save_data()
+        self._weights_by_aid[assignment_id] = assignment.weight
+        # Grades loaded for this ID before it existed now count towards averages
+        for student_id, student_grades in self._grades_by_student.items():
+            if assignment_id in student_grades:
+                self._recompute_totals(student_id)
+        self._invalidate_caches()
+        self._mark_dirty()
         return assignment
     
     def add_grade(self, student_id: int, assignment_id: int, score: float) -> Grade:
@@ -264,87 +422,101 @@ class Gradebook:
         if assignment_id not in self.assignments:
             raise ValueError("Assignment not found")
         
-        # Remove existing grade if it exists
-        self.grades = [g for g in self.grades 
-                      if not (g.student_id == student_id and g.assignment_id == assignment_id)]
-        
-        # Add new grade
         grade = Grade(student_id, assignment_id, score)
-        self.grades.append(grade)
-        self._save_data()
+        student_grades = self._grades_by_student.setdefault(student_id, {})
+        
+        existing = student_grades.get(assignment_id)
+        if existing == grade:
+            # Re-recording the same score changes nothing, so skip the file rewrite
+            return existing
+        
+        # Remove existing grade if it exists, then add the new one last
+        student_grades.pop(assignment_id, None)
+        student_grades[assignment_id] = grade
+        self._recompute_totals(student_id)
+        self._invalidate_caches()
+        self._mark_dirty()
         return grade
     
+    def _refresh_snapshots(self):
+        """Rebuild the dict snapshots if the data changed since they were taken"""
+        if self._snap_version == self._version:
+            return
+        self._students_snap = [student.to_dict() for student in self.students.values()]
+        self._assignments_snap = [assignment.to_dict() for assignment in self.assignments.values()]
+        self._grades_snap = [grade.to_dict() for grade in self.grades]
+        self._snap_version = self._version
+    
     def get_students(self) -> List[Dict]:
         """Get all students as dictionaries (for compatibility with existing templates)"""
-        return [student.to_dict() for student in self.students.values()]
+        self._refresh_snapshots()
+        return list(self._students_snap)
     
     def get_assignments(self) -> List[Dict]:
         """Get all assignments as dictionaries (for compatibility with existing templates)"""
-        return [assignment.to_dict() for assignment in self.assignments.values()]
+        self._refresh_snapshots()
+        return list(self._assignments_snap)
     
     def get_grades(self) -> List[Dict]:
         """Get all grades as dictionaries (for compatibility with existing templates)"""
-        return [grade.to_dict() for grade in self.grades]
+        self._refresh_snapshots()
+        return list(self._grades_snap)
     
     def compute_weighted_average_for_student(self, student_id: int) -> Optional[float]:
         """Compute weighted average for a student"""
         if student_id not in self.students:
             return None
         
-        student_grades = [g for g in self.grades if g.student_id == student_id]
-        if not student_grades:
-            return None
-        
-        total_weighted = 0.0
-        total_weight = 0.0
-        
-        for grade in student_grades:
-            if grade.assignment_id in self.assignments:
-                assignment = self.assignments[grade.assignment_id]
-                total_weighted += grade.score * assignment.weight
-                total_weight += assignment.weight
-        
+        total_weight = self._w_den.get(student_id, 0.0)
         if total_weight == 0:
             return None
-        return total_weighted / total_weight
+        return self._w_num[student_id] / total_weight
     
-    def compute_gpa_for_student(self, student_id: int) -> Optional[float]:
-        """Compute GPA for a student"""
+    def compute_summary_for_student(self, student_id: int) -> Tuple[Optional[float], Optional[float]]:
+        """Compute (weighted average, GPA) for a student"""
         percent = self.compute_weighted_average_for_student(student_id)
         if percent is None:
-            return None
-        return self.percent_to_gpa(percent)
+            return None, None
+        return percent, self.percent_to_gpa(percent)
+    
+    def compute_gpa_for_student(self, student_id: int) -> Optional[float]:
+        """Compute GPA for a student"""
+        return self.compute_summary_for_student(student_id)[1]
     
     @staticmethod
     def percent_to_gpa(percent: float) -> float:
         """Convert percentage to GPA on 4.0 scale"""
-        if percent >= 90:
-            return 4.0
-        elif percent >= 80:
-            return 3.0
-        elif percent >= 70:
-            return 2.0
-        elif percent >= 60:
-            return 1.0
-        return 0.0
-    
-    def compute_class_average(self) -> Optional[float]:
-        """Compute class average"""
+        if math.isnan(percent):
+            return 0.0
+        # Clamping before int() also maps +inf to 4.0 and -inf to 0.0
+        return _GPA_TABLE[int(min(max(percent, 0), 100)) // 10]
+    
+    def compute_all_summaries(self) -> Dict[int, Tuple[float, float]]:
+        """Compute (weighted average, GPA) for every graded student (cached until the next mutation)"""
+        if self._summaries_cache is None or self._summaries_cache[0] != self._version:
+            summaries = {}
+            w_num = self._w_num
+            
+            for student_id, total_weight in self._w_den.items():
+                if total_weight == 0 or student_id not in self.students:
+                    continue
+                avg = w_num[student_id] / total_weight
+                summaries[student_id] = (avg, self.percent_to_gpa(avg))
+            self._summaries_cache = (self._version, summaries)
+        
+        # Hand out a copy so callers can't corrupt the cached dict
+        return dict(self._summaries_cache[1])
+    
+    def compute_class_average(self, summaries: Optional[Dict[int, Tuple[float, float]]] = None) -> Optional[float]:
+        """Compute class average, optionally reusing precomputed summaries"""
         if not self.students:
             return None
         
-        total = 0.0
-        count = 0
-        
-        for student_id in self.students.keys():
-            avg = self.compute_weighted_average_for_student(student_id)
-            if avg is not None:
-                total += avg
-                count += 1
-        
-        if count == 0:
+        if summaries is None:
+            summaries = self.compute_all_summaries()
+        if not summaries:
             return None
-        return total / count
+        return sum(avg for avg, _ in summaries.values()) / len(summaries)
     
     def export_student_csv(self, student_id: int) -> str:
         """Export student report as CSV"""
@@ -352,68 +524,79 @@ class Gradebook:
             raise ValueError("Student not found")
         
         student = self.students[student_id]
-        student_grades = [g for g in self.grades if g.student_id == student_id]
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
+        student_grades = self._grades_by_student.get(student_id, {}).values()
         
         # Header
-        writer.writerow(["Student ID", "Student Name", student.id, student.name])
-        writer.writerow([])
-        writer.writerow(["Assignment ID", "Title", "Type", "Weight", "Score"])
+        rows = [
+            ["Student ID", "Student Name", student.id, student.name],
+            [],
+            ["Assignment ID", "Title", "Type", "Weight", "Score"],
+        ]
         
         # Grades
-        for grade in student_grades:
-            if grade.assignment_id in self.assignments:
-                assignment = self.assignments[grade.assignment_id]
-                writer.writerow([
-                    assignment.id, 
-                    assignment.title, 
-                    assignment.get_assignment_type(),
-                    assignment.weight, 
-                    grade.score
-                ])
+        assignments = self.assignments
+        rows.extend(
+            [assignment.id, assignment.title, assignment.TYPE,
+             assignment.weight, grade.score]
+            for grade in student_grades
+            if (assignment := assignments.get(grade.assignment_id)) is not None
+        )
         
         # Summary
-        avg = self.compute_weighted_average_for_student(student_id)
-        gpa = self.compute_gpa_for_student(student_id)
-        writer.writerow([])
-        writer.writerow(["Final Weighted Average", avg if avg is not None else "N/A"])
-        writer.writerow(["GPA", gpa if gpa is not None else "N/A"])
+        avg, gpa = self.compute_summary_for_student(student_id)
+        rows.append([])
+        rows.append(["Final Weighted Average", avg if avg is not None else "N/A"])
+        rows.append(["GPA", gpa if gpa is not None else "N/A"])
         
+        output = io.StringIO()
+        csv.writer(output).writerows(rows)
         return output.getvalue()
 
 
-# Global gradebook instance for backward compatibility with existing Flask app
-_gradebook = Gradebook()
+# Global gradebook instance for backward compatibility with existing Flask app,
+# created on first use so importing this module does no disk I/O
+_gradebook: Optional[Gradebook] = None
+
+def _get_gradebook() -> Gradebook:
+    global _gradebook
+    if _gradebook is None:
+        _gradebook = Gradebook()
+    return _gradebook
 
 # Functions for backward compatibility with existing Flask app
 def get_students(file_path: Optional[Path] = None) -> List[Dict]:
-    return _gradebook.get_students()
+    return _get_gradebook().get_students()
 
 def get_assignments(file_path: Optional[Path] = None) -> List[Dict]:
-    return _gradebook.get_assignments()
+    return _get_gradebook().get_assignments()
 
 def get_grades(file_path: Optional[Path] = None) -> List[Dict]:
-    return _gradebook.get_grades()
+    return _get_gradebook().get_grades()
 
 def add_student(name: str, student_id: Optional[int] = None, file_path: Optional[Path] = None) -> Dict:
-    return _gradebook.add_student(name, student_id).to_dict()
+    return _get_gradebook().add_student(name, student_id).to_dict()
 
 def add_assignment(title: str, weight: float = 1.0, file_path: Optional[Path] = None) -> Dict:
-    return _gradebook.add_assignment(title, weight).to_dict()
+    return _get_gradebook().add_assignment(title, weight).to_dict()
 
 def add_grade(student_id: int, assignment_id: int, score: float, file_path: Optional[Path] = None) -> Dict:
-    return _gradebook.add_grade(student_id, assignment_id, score).to_dict()
+    return _get_gradebook().add_grade(student_id, assignment_id, score).to_dict()
 
 def compute_weighted_average_for_student(student_id: int, file_path: Optional[Path] = None) -> Optional[float]:
-    return _gradebook.compute_weighted_average_for_student(student_id)
+    return _get_gradebook().compute_weighted_average_for_student(student_id)
 
 def compute_gpa_for_student(student_id: int, file_path: Optional[Path] = None) -> Optional[float]:
-    return _gradebook.compute_gpa_for_student(student_id)
+    return _get_gradebook().compute_gpa_for_student(student_id)
+
+def compute_summary_for_student(student_id: int, file_path: Optional[Path] = None) -> Tuple[Optional[float], Optional[float]]:
+    return _get_gradebook().compute_summary_for_student(student_id)
+
+def compute_all_summaries(file_path: Optional[Path] = None) -> Dict[int, Tuple[float, float]]:
+    return _get_gradebook().compute_all_summaries()
 
-def compute_class_average(file_path: Optional[Path] = None) -> Optional[float]:
-    return _gradebook.compute_class_average()
+def compute_class_average(file_path: Optional[Path] = None, *,
+                          summaries: Optional[Dict[int, Tuple[float, float]]] = None) -> Optional[float]:
+    return _get_gradebook().compute_class_average(summaries)
 
 def export_student_csv(student_id: int, file_path: Optional[Path] = None) -> str:
-    return _gradebook.export_student_csv(student_id)
\ No newline at end of file
+    return _get_gradebook().export_student_csv(student_id)
\ No newline at end of file
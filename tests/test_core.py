@@ -1,5 +1,5 @@
 import pytest
-from src.storage import Gradebook
+from src.storage import Assignment, Grade, Gradebook
 
 def test_add_student_and_assignment(tmp_path):
     gb = Gradebook(file_path=tmp_path / "test.json")
@@ -27,3 +27,310 @@ def test_record_and_average(tmp_path):
 
     assert avg == pytest.approx(90.0)
     assert gpa == 4.0
+    assert gb.compute_summary_for_student(1) == (pytest.approx(90.0), 4.0)
+
+def test_all_summaries_and_class_average(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_student("Bob", 2)
+    gb.add_student("Carol", 3)
+    gb.add_assignment("Math", 2.0, "exam")
+    gb.add_assignment("Quiz", 1.0, "quiz")
+
+    gb.add_grade(1, 1, 90)
+    gb.add_grade(1, 2, 60)
+    gb.add_grade(2, 1, 70)
+
+    summaries = gb.compute_all_summaries()
+
+    assert summaries[1] == (pytest.approx(80.0), 3.0)
+    assert summaries[2] == (pytest.approx(70.0), 2.0)
+    assert 3 not in summaries
+    assert gb.compute_class_average() == pytest.approx(75.0)
+    assert gb.compute_class_average(summaries) == pytest.approx(75.0)
+
+def test_regrade_replaces_existing_grade(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+
+    gb.add_grade(1, 1, 50)
+    gb.add_grade(1, 1, 95)
+
+    assert len(gb.grades) == 1
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(95.0)
+
+    reloaded = Gradebook(file_path=tmp_path / "test.json")
+    assert reloaded.get_grades() == [{"student_id": 1, "assignment_id": 1, "score": 95}]
+
+def test_rerecording_same_grade_skips_save(tmp_path):
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 80)
+
+    path.write_text('{"students": [], "assignments": [], "grades": []}')
+    gb.add_grade(1, 1, 80)
+
+    assert Gradebook(file_path=path).get_grades() == []
+
+def test_cached_averages_refresh_after_mutation(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 60)
+
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(60.0)
+    assert gb.compute_class_average() == pytest.approx(60.0)
+
+    gb.add_grade(1, 1, 100)
+
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(100.0)
+    assert gb.compute_class_average() == pytest.approx(100.0)
+
+def test_batched_writes_flush_on_exit(tmp_path):
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    with gb:
+        gb.add_student("Alice", 1)
+        gb.add_assignment("Math", 1.0, "exam")
+        gb.add_grade(1, 1, 75)
+        assert Gradebook(file_path=path).get_students() == []
+
+    reloaded = Gradebook(file_path=path)
+    assert reloaded.get_students() == [{"id": 1, "name": "Alice"}]
+    assert reloaded.compute_weighted_average_for_student(1) == pytest.approx(75.0)
+
+def test_auto_ids_follow_highest_existing_id(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 5)
+    assert gb.add_student("Bob").id == 6
+    assert gb.add_assignment("Math").id == 1
+
+    reloaded = Gradebook(file_path=tmp_path / "test.json")
+    assert reloaded.add_student("Carol").id == 7
+    assert reloaded.add_assignment("Science").id == 2
+
+def test_export_student_csv(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 2.0, "exam")
+    gb.add_assignment("Reading", 1.0, "homework")
+    gb.add_grade(1, 1, 90)
+    gb.add_grade(1, 2, 60)
+
+    lines = gb.export_student_csv(1).splitlines()
+
+    assert lines[0] == "Student ID,Student Name,1,Alice"
+    assert lines[2] == "Assignment ID,Title,Type,Weight,Score"
+    assert lines[3:5] == ["1,Math,exam,2.0,90", "2,Reading,homework,1.0,60"]
+    assert lines[-2:] == ["Final Weighted Average,80.0", "GPA,3.0"]
+
+def test_assignment_types_round_trip(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_assignment("Midterm", 2.0, "exam")
+    gb.add_assignment("Pop Quiz", 0.5, "Quiz")
+    gb.add_assignment("Essay", 1.0, "homework")
+    gb.add_assignment("Other", 1.0, "unknown")
+
+    reloaded = Gradebook(file_path=tmp_path / "test.json")
+    types = [a["type"] for a in reloaded.get_assignments()]
+
+    assert types == ["exam", "quiz", "homework", "exam"]
+
+def test_save_replaces_file_without_leftover_temp(tmp_path):
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    gb.add_student("Alice", 1)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test.json"]
+    assert Gradebook(file_path=path).get_students() == [{"id": 1, "name": "Alice"}]
+
+def test_snapshots_refresh_after_mutation(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.get_students().append({"id": 99, "name": "Mallory"})
+    assert gb.get_students() == [{"id": 1, "name": "Alice"}]
+
+    gb.add_student("Bob", 2)
+    assert gb.get_students() == [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}]
+
+@pytest.mark.parametrize("percent, gpa", [
+    (100, 4.0), (90, 4.0), (89.99, 3.0), (80, 3.0), (79.5, 2.0),
+    (70, 2.0), (60, 1.0), (59.99, 0.0), (0, 0.0), (-1, 0.0), (120, 4.0),
+    (float("nan"), 0.0), (float("inf"), 4.0), (float("-inf"), 0.0),
+])
+def test_percent_to_gpa(percent, gpa):
+    assert Gradebook.percent_to_gpa(percent) == gpa
+
+def test_load_large_data_file(tmp_path):
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    with gb:
+        for i in range(1, 201):
+            gb.add_student(f"Student {i}")
+        gb.add_assignment("Math", 1.0, "exam")
+        for i in range(1, 201):
+            gb.add_grade(i, 1, i % 100)
+
+    assert path.stat().st_size > 4096
+    reloaded = Gradebook(file_path=path)
+    assert len(reloaded.get_students()) == 200
+    assert reloaded.compute_weighted_average_for_student(150) == pytest.approx(50.0)
+
+def test_regrades_do_not_accumulate_rounding_error(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("A", 1.0)
+    gb.add_assignment("B", 2.0)
+    gb.add_assignment("C", 1.0)
+    for score in (70.1, 85.3, 62.7, 99.9, 43.3):
+        for assignment_id in (1, 2, 3):
+            gb.add_grade(1, assignment_id, score)
+    for assignment_id in (1, 2, 3):
+        gb.add_grade(1, assignment_id, 90)
+
+    assert gb.compute_weighted_average_for_student(1) == 90.0
+    assert gb.compute_gpa_for_student(1) == 4.0
+
+def test_duplicate_grade_lines_count_once(tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text(
+        '{"students": [{"id": 1, "name": "Alice"}],'
+        ' "assignments": [{"id": 1, "title": "Math", "weight": 1.0, "type": "exam"},'
+        ' {"id": 2, "title": "Quiz", "weight": 1.0, "type": "quiz"}],'
+        ' "grades": [{"student_id": 1, "assignment_id": 1, "score": 50},'
+        ' {"student_id": 1, "assignment_id": 1, "score": 50},'
+        ' {"student_id": 1, "assignment_id": 2, "score": 100}]}'
+    )
+    gb = Gradebook(file_path=path)
+
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(75.0)
+    assert gb.compute_all_summaries()[1][0] == pytest.approx(75.0)
+
+def test_oversized_student_id_rejected(tmp_path):
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    with pytest.raises(ValueError):
+        gb.add_student("Huge", 99999999999999999999)
+    gb.add_student("Alice")
+
+    assert gb.get_students() == [{"id": 1, "name": "Alice"}]
+    assert Gradebook(file_path=path).get_students() == [{"id": 1, "name": "Alice"}]
+
+def test_class_average_ignores_partial_summaries_for_cache(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_student("Bob", 2)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 100)
+    gb.add_grade(2, 1, 50)
+
+    assert gb.compute_class_average({1: (100.0, 4.0)}) == pytest.approx(100.0)
+    assert gb.compute_class_average() == pytest.approx(75.0)
+
+def test_assignment_base_class_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        Assignment(1, "Math")
+
+def test_module_class_average_keeps_file_path_first(tmp_path, monkeypatch):
+    import src.storage as storage
+
+    gb = Gradebook(file_path=tmp_path / "test.json")
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 80)
+    monkeypatch.setattr(storage, "_gradebook", gb)
+
+    assert storage.compute_class_average(tmp_path / "test.json") == pytest.approx(80.0)
+    assert storage.compute_class_average(summaries={1: (60.0, 1.0)}) == pytest.approx(60.0)
+
+def test_grades_are_read_only_but_assignable(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 40)
+
+    with pytest.raises(AttributeError):
+        gb.grades.append(Grade(1, 1, 90))
+
+    gb.grades = [Grade(1, 1, 90)]
+    assert gb.grades == (Grade(1, 1, 90),)
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(90.0)
+
+def test_summaries_cache_refreshes_and_is_not_aliased(tmp_path):
+    gb = Gradebook(file_path=tmp_path / "test.json")
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 70)
+
+    summaries = gb.compute_all_summaries()
+    summaries.clear()
+    assert gb.compute_all_summaries() == {1: (pytest.approx(70.0), 2.0)}
+
+    gb.add_grade(1, 1, 95)
+    assert gb.compute_all_summaries() == {1: (pytest.approx(95.0), 4.0)}
+
+def test_nested_batches_flush_only_at_outermost_exit(tmp_path):
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    with gb:
+        with gb:
+            gb.add_student("Alice", 1)
+        gb.add_student("Bob", 2)
+        assert Gradebook(file_path=path).get_students() == []
+
+    assert len(Gradebook(file_path=path).get_students()) == 2
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_values_rejected_before_save(tmp_path, value):
+    pytest.importorskip("orjson")
+    path = tmp_path / "test.json"
+    gb = Gradebook(file_path=path)
+
+    gb.add_student("Alice", 1)
+    gb.add_assignment("Math", 1.0, "exam")
+    gb.add_grade(1, 1, 80)
+
+    with pytest.raises(ValueError):
+        gb.add_grade(1, 1, value)
+    with pytest.raises(ValueError):
+        gb.add_assignment("Bad", value)
+
+    reloaded = Gradebook(file_path=path)
+    assert reloaded.get_grades() == [{"student_id": 1, "assignment_id": 1, "score": 80}]
+    assert len(reloaded.get_assignments()) == 1
+
+def test_new_assignment_picks_up_orphaned_grades(tmp_path):
+    path = tmp_path / "test.json"
+    path.write_text(
+        '{"students": [{"id": 1, "name": "Alice"}],'
+        ' "assignments": [{"id": 1, "title": "Math", "weight": 1.0, "type": "exam"}],'
+        ' "grades": [{"student_id": 1, "assignment_id": 1, "score": 50},'
+        ' {"student_id": 1, "assignment_id": 2, "score": 100}]}'
+    )
+    gb = Gradebook(file_path=path)
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(50.0)
+
+    assert gb.add_assignment("Quiz", 1.0, "quiz").id == 2
+
+    assert gb.compute_weighted_average_for_student(1) == pytest.approx(75.0)
+    assert Gradebook(file_path=path).compute_weighted_average_for_student(1) == pytest.approx(75.0)